@@ -4,25 +4,53 @@ Main application module for Epic Games Freebie Auto-Claimer Bot.
 
 import os
 import sys
+import json
 import time
+import queue
+import signal
 import logging
+import logging.handlers
 import argparse
+import threading
 from datetime import datetime
-from dotenv import load_dotenv
 
+from epic_games_bot.config import get_config
 from epic_games_bot.epic import EpicGamesClient
 from epic_games_bot.notifier import NotificationManager
 from epic_games_bot.scheduler import Scheduler
-from epic_games_bot.telegram_bot import TelegramBot
 
-# Configure logging
+# Configure logging. Records go through a queue drained by a listener
+# thread, so logging calls on the scheduler/claim hot path never block
+# on disk I/O.
+_log_queue = queue.Queue(-1)
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+_stream_handler = logging.StreamHandler(sys.stdout)
+_stream_handler.setFormatter(_log_formatter)
+_file_handler = logging.FileHandler('epic_games_bot.log')
+_file_handler.setFormatter(_log_formatter)
+
+# Buffer file writes so routine INFO records are flushed to disk in batches
+# rather than one write syscall per record; warnings and errors flush
+# immediately
+_memory_handler = logging.handlers.MemoryHandler(
+    capacity=200,
+    flushLevel=logging.WARNING,
+    target=_file_handler,
+    flushOnClose=True
+)
+
+_log_listener = logging.handlers.QueueListener(_log_queue, _stream_handler, _memory_handler)
+_log_listener.start()
+
+# The queue handler only merges arguments; the listener's handlers apply
+# the real format string
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('epic_games_bot.log')
-    ]
+    handlers=[_queue_handler]
 )
 
 logger = logging.getLogger(__name__)
@@ -36,9 +64,6 @@ class EpicGamesFreebieClaimer:
         Args:
             data_dir: Directory to store data files
         """
-        # Load environment variables
-        load_dotenv()
-        
         # Create data directory
         os.makedirs(data_dir, exist_ok=True)
         
@@ -46,26 +71,39 @@ class EpicGamesFreebieClaimer:
         self.epic_client = EpicGamesClient(data_dir=data_dir)
         self.notifier = NotificationManager()
         self.scheduler = Scheduler()
+
+        # On-disk cache for free-games lookups; the storefront rotates
+        # weekly, so repeated checks within the TTL skip the HTTPS round-trip
+        self.free_games_cache_file = os.path.join(data_dir, "free_games_cache.json")
+        self.free_games_cache_ttl = 3600
         
-        # Get credentials from environment
-        self.username = os.environ.get('EPIC_USERNAME')
-        self.password = os.environ.get('EPIC_PASSWORD')
-        
+        # Get credentials from the cached environment config
+        config = get_config()
+        self.username = config.epic_username
+        self.password = config.epic_password
+
         if not self.username or not self.password:
             logger.error("Epic Games credentials not found in environment variables")
             raise ValueError("EPIC_USERNAME and EPIC_PASSWORD environment variables are required")
-        
+
         # Initialize Telegram bot if token is available
         self.telegram_bot = None
-        telegram_token = os.environ.get('TELEGRAM_BOT_TOKEN')
-        telegram_chat_ids = os.environ.get('TELEGRAM_CHAT_ID', '').split(',')
-        
+        telegram_token = config.telegram_token
+        telegram_chat_ids = config.telegram_chat_ids
+
         if telegram_token and telegram_chat_ids:
+            # python-telegram-bot is the heaviest import in the project;
+            # only pay for it when the bot is actually configured
+            from epic_games_bot.telegram_bot import TelegramBot
+
             self.telegram_bot = TelegramBot(
                 token=telegram_token,
                 authorized_chat_ids=telegram_chat_ids,
                 epic_client=self.epic_client,
-                notifier=self.notifier
+                notifier=self.notifier,
+                loop=self.scheduler.loop,
+                webhook_url=config.telegram_webhook_url,
+                webhook_port=config.telegram_webhook_port
             )
             logger.info("Telegram bot initialized")
         
@@ -94,6 +132,15 @@ class EpicGamesFreebieClaimer:
             self.check_and_claim_free_games,
             name="startup_free_games_check"
         )
+
+        # Flush buffered log records periodically so idle periods still
+        # reach the log file
+        self.scheduler.add_interval_job(
+            _memory_handler.flush,
+            hours=0,
+            seconds=5,
+            name="log_flush"
+        )
         
         # Start Telegram bot if available
         if self.telegram_bot:
@@ -111,8 +158,12 @@ class EpicGamesFreebieClaimer:
         
         # Stop scheduler
         self.scheduler.shutdown()
-        
+
         logger.info("Epic Games Freebie Auto-Claimer stopped")
+
+        # Flush any queued/buffered log records before the process exits
+        _log_listener.stop()
+        _memory_handler.flush()
     
     def check_and_claim_free_games(self):
         """Check for and claim free games."""
@@ -145,26 +196,75 @@ class EpicGamesFreebieClaimer:
                     self.notifier.send_error_notification("Failed to log in to Epic Games account")
                     return
         
-        # Get free games
-        free_games = self.epic_client.get_free_games()
-        
+        # Get free games (served from the on-disk cache when fresh)
+        free_games = self._cached_free_games()
+
         if not free_games:
             logger.info("No new free games found")
             return
         
         logger.info(f"Found {len(free_games)} new free games")
         
-        # Claim each free game
+        # Claim each free game, then notify once for the whole batch so a
+        # multi-game cycle costs one API call per channel instead of one per game
+        claimed = []
         for game in free_games:
             title = game.get('title', 'Unknown Game')
+
+            # The cached free-games list can be stale, so re-check the
+            # claimed set before paying for a claim request
+            if game.get('id') in self.epic_client.claimed_games:
+                logger.info(f"Game '{title}' already claimed, skipping")
+                continue
+
             logger.info(f"Attempting to claim: {title}")
-            
+
             if self.epic_client.claim_game(game):
                 logger.info(f"Successfully claimed: {title}")
-                self.notifier.send_game_claimed_notification(game)
+                claimed.append(game)
             else:
                 logger.error(f"Failed to claim: {title}")
                 self.notifier.send_error_notification(f"Failed to claim free game: {title}")
+
+        if claimed:
+            self.notifier.send_games_claimed_batch(claimed)
+            # Drop the cache so the next check reflects the updated
+            # claimed-games state
+            self._invalidate_free_games_cache()
+
+    def _cached_free_games(self):
+        """Get free games, using the on-disk cache when still fresh.
+
+        Returns:
+            List of free game data dictionaries
+        """
+        try:
+            if os.path.exists(self.free_games_cache_file):
+                with open(self.free_games_cache_file, 'r') as f:
+                    cached = json.load(f)
+                if time.time() - cached.get('fetched_at', 0) < self.free_games_cache_ttl:
+                    logger.info("Using cached free games list")
+                    return cached.get('games', [])
+        except Exception as e:
+            logger.error(f"Failed to read free games cache: {e}")
+
+        free_games = self.epic_client.get_free_games()
+
+        try:
+            with open(self.free_games_cache_file, 'w') as f:
+                json.dump({'fetched_at': time.time(), 'games': free_games}, f)
+        except Exception as e:
+            logger.error(f"Failed to write free games cache: {e}")
+
+        return free_games
+
+    def _invalidate_free_games_cache(self):
+        """Remove the on-disk free games cache."""
+        try:
+            if os.path.exists(self.free_games_cache_file):
+                os.remove(self.free_games_cache_file)
+        except Exception as e:
+            logger.error(f"Failed to invalidate free games cache: {e}")
     
     def handle_2fa(self, code):
         """Handle 2FA authentication.
@@ -210,13 +310,16 @@ def main():
         else:
             # Normal startup
             app.start()
-            
-            # Keep the main thread alive
+
+            # Park the main thread until a termination signal arrives instead
+            # of waking up every second just to stay alive
+            stop_event = threading.Event()
+            signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+            signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+
             try:
-                while True:
-                    time.sleep(1)
-            except KeyboardInterrupt:
-                logger.info("Keyboard interrupt received")
+                stop_event.wait()
+                logger.info("Shutdown signal received")
             finally:
                 app.stop()
     
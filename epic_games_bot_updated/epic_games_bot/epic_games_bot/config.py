@@ -0,0 +1,64 @@
+"""
+Configuration module for Epic Games Freebie Auto-Claimer Bot.
+Parses environment variables once and exposes them as a frozen config object.
+"""
+
+import os
+import functools
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Config:
+    """Parsed environment configuration."""
+
+    epic_username: Optional[str]
+    epic_password: Optional[str]
+    telegram_token: Optional[str]
+    telegram_chat_ids: Tuple[str, ...]
+    telegram_webhook_url: Optional[str]
+    telegram_webhook_port: int
+    discord_webhook_url: Optional[str]
+
+
+@functools.lru_cache(maxsize=1)
+def _load_env() -> bool:
+    """Read the .env file into os.environ, at most once per process.
+
+    load_dotenv() stats, opens and parses the file on every call; caching
+    it avoids a disk read each time a component is constructed.
+
+    Returns:
+        bool: Always True (lru_cache needs a return value to memoize)
+    """
+    from dotenv import load_dotenv
+    load_dotenv()
+    return True
+
+
+@functools.lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Load configuration from the environment.
+
+    The result is cached, so the environment is read and the chat ID list
+    parsed only once per process instead of on every component construction.
+
+    Returns:
+        Config: Frozen configuration object
+    """
+    _load_env()
+    raw_chat_ids = os.environ.get('TELEGRAM_CHAT_ID', '')
+    return Config(
+        epic_username=os.environ.get('EPIC_USERNAME'),
+        epic_password=os.environ.get('EPIC_PASSWORD'),
+        telegram_token=os.environ.get('TELEGRAM_BOT_TOKEN'),
+        # Filter out empties: ''.split(',') yields [''], which is truthy and
+        # used to let a bogus chat ID through when the variable was unset
+        telegram_chat_ids=tuple(cid for cid in (x.strip() for x in raw_chat_ids.split(',')) if cid),
+        # When set, the Telegram bot receives updates by webhook instead of
+        # long polling
+        telegram_webhook_url=os.environ.get('TELEGRAM_WEBHOOK_URL'),
+        telegram_webhook_port=int(os.environ.get('TELEGRAM_WEBHOOK_PORT', '8443')),
+        discord_webhook_url=os.environ.get('DISCORD_WEBHOOK_URL'),
+    )
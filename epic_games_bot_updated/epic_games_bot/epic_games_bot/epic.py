@@ -6,12 +6,71 @@ Handles authentication, free games discovery, and claiming.
 import os
 import json
 import time
+import asyncio
 import logging
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse, parse_qs
+from urllib3.util.retry import Retry
 from typing import Dict, List, Optional, Tuple, Any
 
 logger = logging.getLogger(__name__)
 
+# orjson parses the multi-MB catalog response several times faster than
+# stdlib json and serializes without intermediate str objects; stdlib is
+# the fallback when it isn't installed
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+# ijson streams the catalog's elements array without materializing the
+# full object tree (descriptions, keyImages, ... of every entry); optional
+# for the same reason as orjson
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# httpx can multiplex all claim mutations over one HTTP/2 connection,
+# avoiding per-socket head-of-line blocking; the requests session remains
+# the default transport
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Hop-by-hop headers must not be forwarded to the HTTP/2 async client:
+# h2 rejects them outright, so a leaked Connection header would fail
+# every request on that path
+_HOP_BY_HOP = frozenset({"connection", "keep-alive", "te", "upgrade"})
+
+# Default request headers, built once at module scope; Accept-Encoding
+# lets the server gzip the catalog body, by far the largest payload.
+# Only codings urllib3 can decode without extra packages — advertising
+# br without brotli installed breaks decoding when the server picks it
+_DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Encoding": "gzip, deflate",
+    "Content-Type": "application/json",
+    "Referer": "https://www.epicgames.com/store/",
+    "Origin": "https://www.epicgames.com",
+    "Connection": "keep-alive"
+}
+
 class EpicGamesClient:
     """Client for interacting with Epic Games Store API."""
     
@@ -26,21 +85,55 @@ class EpicGamesClient:
     
     # Client credentials
     CLIENT_ID = "875a3b57d3a640a6b7f9b4e883463ab4"  # Epic Games Web Store client ID
+
+    # GraphQL mutation to purchase (claim) a game; only the offer fields
+    # vary per call, so the query and the static parameter shape are built
+    # once here instead of per claim
+    _CLAIM_QUERY = """
+    mutation purchaseOrderMutation($orderPurchaseParams: OrderPurchaseParams!) {
+        purchaseOrder(orderPurchaseParams: $orderPurchaseParams) {
+            orderResponse {
+                orderResponseCode
+                orderNumber
+                orderComplete
+                orderError
+            }
+        }
+    }
+    """
+
+    _CLAIM_PARAMS_TEMPLATE = {
+        "quantity": 1,
+        "currency": "USD"
+    }
     
-    def __init__(self, data_dir: str = "./data"):
+    def __init__(self, data_dir: str = "./data", free_games_ttl: int = 60):
         """Initialize Epic Games client.
         
         Args:
             data_dir: Directory to store session and claimed games data
+            free_games_ttl: Seconds to reuse a fetched free-games list
+                before re-contacting the catalog endpoint
         """
         self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Accept": "application/json, text/plain, */*",
-            "Content-Type": "application/json",
-            "Referer": "https://www.epicgames.com/store/",
-            "Origin": "https://www.epicgames.com"
-        })
+
+        # Keep-alive pool sized for the three Epic hosts this client talks
+        # to (store, content CDN, GraphQL), so repeated calls reuse warm
+        # TLS connections instead of re-handshaking; transient 5xx/429
+        # responses are retried with backoff at the transport layer
+        retries = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'POST'])
+        )
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=retries
+        ))
+
+        self.session.headers.update(_DEFAULT_HEADERS)
         
         # Create data directory if it doesn't exist
         self.data_dir = data_dir
@@ -48,35 +141,86 @@ class EpicGamesClient:
         
         # Path to store session data
         self.session_file = os.path.join(self.data_dir, "session.json")
-        # Path to store claimed games data
-        self.claimed_games_file = os.path.join(self.data_dir, "claimed_games.json")
+        # Path to store claimed games data, one ID per line so a new claim
+        # appends a single line instead of rewriting the whole file
+        self.claimed_games_file = os.path.join(self.data_dir, "claimed_games.ndjson")
+        # Older installs stored a JSON list; migrated on first load
+        self._legacy_claimed_file = os.path.join(self.data_dir, "claimed_games.json")
         
         # Load existing session if available
         self.access_token = None
         self.refresh_token = None
         self.account_id = None
         self.expires_at = 0
+        # Refresh threshold, recomputed whenever expires_at changes so the
+        # per-call expiry check is a single comparison
+        self._refresh_at = 0
         self._load_session()
         
-        # Load claimed games
+        # Conditional-request cache for the free games catalog: on a 304
+        # the body is neither re-downloaded nor re-parsed
+        self.catalog_cache_file = os.path.join(self.data_dir, "catalog_cache.json")
+        self._catalog_etag = None
+        self._catalog_cached = []
+        self._load_catalog_cache()
+
+        # Load claimed games; the lock keeps bookkeeping consistent when
+        # claims run concurrently
         self.claimed_games = self._load_claimed_games()
+        self._claimed_lock = threading.Lock()
+
+        # Shared async client, created lazily on first async claim
+        self._aclient = None
+
+        # In-process TTL cache of the filtered free-games result, so
+        # back-to-back calls (retries, check-then-claim) skip the whole
+        # HTTP + parse + filter pipeline
+        self._free_games_ttl = free_games_ttl
+        self._free_games_cache = None
+
+        # Refresh the OAuth token in the background shortly before it
+        # expires, so get_free_games/claim_game never block on a refresh
+        # round-trip; the inline refresh in ensure_authenticated stays as
+        # a safety net
+        self._token_lock = threading.Lock()
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop, daemon=True, name="token-refresh"
+        )
+        self._refresh_thread.start()
     
+    @staticmethod
+    def _atomic_write(path: str, data: bytes) -> None:
+        """Write a file atomically via a sibling tempfile and os.replace.
+
+        A crash mid-write leaves the old file intact instead of a
+        truncated one.
+        """
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _apply_access_token(self, token: str) -> None:
+        """Set the Authorization header, skipping no-op rewrites."""
+        auth = f"Bearer {token}"
+        if self.session.headers.get("Authorization") != auth:
+            self.session.headers["Authorization"] = auth
+
     def _load_session(self) -> None:
         """Load session data from file if it exists."""
         try:
             if os.path.exists(self.session_file):
-                with open(self.session_file, 'r') as f:
-                    session_data = json.load(f)
+                with open(self.session_file, 'rb') as f:
+                    session_data = _json_loads(f.read())
                     self.access_token = session_data.get('access_token')
                     self.refresh_token = session_data.get('refresh_token')
                     self.account_id = session_data.get('account_id')
                     self.expires_at = session_data.get('expires_at', 0)
+                    self._refresh_at = self.expires_at - 300
                     
                     # Update session headers with token
                     if self.access_token:
-                        self.session.headers.update({
-                            "Authorization": f"Bearer {self.access_token}"
-                        })
+                        self._apply_access_token(self.access_token)
                     
                     logger.info("Loaded existing session")
         except Exception as e:
@@ -91,43 +235,118 @@ class EpicGamesClient:
                 'account_id': self.account_id,
                 'expires_at': self.expires_at
             }
-            with open(self.session_file, 'w') as f:
-                json.dump(session_data, f)
+            self._atomic_write(self.session_file, _json_dumps(session_data))
             logger.info("Saved session data")
         except Exception as e:
             logger.error(f"Failed to save session: {e}")
     
-    def _load_claimed_games(self) -> List[str]:
-        """Load list of claimed games from file."""
+    def _load_claimed_games(self) -> set:
+        """Load the set of claimed game IDs from file.
+
+        A set gives O(1) membership checks in get_free_games, where the
+        old list was scanned once per catalog entry.
+        """
         try:
             if os.path.exists(self.claimed_games_file):
                 with open(self.claimed_games_file, 'r') as f:
-                    return json.load(f)
-            return []
+                    lines = [line.strip() for line in f if line.strip()]
+                claimed = set(lines)
+                if len(claimed) != len(lines):
+                    # One-shot compaction of duplicate appends
+                    self._write_claimed_log(claimed)
+                return claimed
+
+            if os.path.exists(self._legacy_claimed_file):
+                with open(self._legacy_claimed_file, 'rb') as f:
+                    claimed = set(_json_loads(f.read()))
+                self._write_claimed_log(claimed)
+                logger.info("Migrated claimed games to append-only log")
+                return claimed
+
+            return set()
         except Exception as e:
             logger.error(f"Failed to load claimed games: {e}")
-            return []
-    
-    def _save_claimed_games(self) -> None:
-        """Save list of claimed games to file."""
+            return set()
+
+    def _write_claimed_log(self, claimed: set) -> None:
+        """Rewrite the claimed-games log in full (migration/compaction)."""
+        self._atomic_write(
+            self.claimed_games_file,
+            ''.join(game_id + '\n' for game_id in claimed).encode()
+        )
+
+    def _append_claimed_game(self, game_id: str) -> None:
+        """Record one newly claimed game ID on disk."""
         try:
-            with open(self.claimed_games_file, 'w') as f:
-                json.dump(self.claimed_games, f)
-            logger.info(f"Saved claimed games list ({len(self.claimed_games)} games)")
+            with open(self.claimed_games_file, 'a') as f:
+                f.write(game_id + '\n')
         except Exception as e:
-            logger.error(f"Failed to save claimed games: {e}")
+            logger.error(f"Failed to save claimed game: {e}")
     
+    def _load_catalog_cache(self) -> None:
+        """Load the cached free-games catalog and its ETag from file."""
+        try:
+            if os.path.exists(self.catalog_cache_file):
+                with open(self.catalog_cache_file, 'rb') as f:
+                    cache = _json_loads(f.read())
+                    self._catalog_etag = cache.get('etag')
+                    self._catalog_cached = cache.get('games', [])
+        except Exception as e:
+            logger.error(f"Failed to load catalog cache: {e}")
+
+    def _save_catalog_cache(self) -> None:
+        """Save the free-games catalog and its ETag to file."""
+        try:
+            self._atomic_write(
+                self.catalog_cache_file,
+                _json_dumps({'etag': self._catalog_etag, 'games': self._catalog_cached})
+            )
+        except Exception as e:
+            logger.error(f"Failed to save catalog cache: {e}")
+
     def _is_token_expired(self) -> bool:
         """Check if the access token is expired."""
-        # Add a 5-minute buffer to ensure we refresh before expiration
-        return time.time() >= (self.expires_at - 300)
+        # _refresh_at already folds in the 5-minute buffer, so the hot
+        # path is one clock read and one comparison
+        return time.time() >= self._refresh_at
     
+    def _refresh_loop(self) -> None:
+        """Keep the access token fresh from a daemon thread.
+
+        Wakes ~5½ minutes before expiry, just ahead of the 5-minute inline
+        buffer in _is_token_expired, so the refresh happens off the claim
+        hot path.
+        """
+        backoff = 60
+        while True:
+            sleep_s = max(10, self.expires_at - time.time() - 330)
+            time.sleep(sleep_s)
+
+            if self.refresh_token and time.time() >= self.expires_at - 330:
+                if self._refresh_access_token():
+                    backoff = 60
+                else:
+                    # A failed refresh leaves expires_at in the past, so
+                    # the 10s floor alone would hammer the OAuth endpoint
+                    # (times the transport-level retries) until the token
+                    # is revived; back off exponentially instead
+                    time.sleep(backoff)
+                    backoff = min(backoff * 2, 3600)
+
     def _refresh_access_token(self) -> bool:
         """Refresh the access token using the refresh token."""
         if not self.refresh_token:
             logger.error("No refresh token available")
             return False
-        
+
+        with self._token_lock:
+            # Another thread may have refreshed while we waited on the lock
+            if self.access_token and time.time() < self.expires_at - 330:
+                return True
+            return self._do_refresh()
+
+    def _do_refresh(self) -> bool:
+        """Perform the refresh request. Caller holds _token_lock."""
         try:
             data = {
                 "grant_type": "refresh_token",
@@ -140,27 +359,81 @@ class EpicGamesClient:
                 json=data
             )
             
-            if response.status_code == 200:
-                token_data = response.json()
+            if response.ok:
+                token_data = _json_loads(response.content)
                 self.access_token = token_data.get('access_token')
                 self.refresh_token = token_data.get('refresh_token')
                 self.expires_at = time.time() + token_data.get('expires_in', 28800)  # Default 8 hours
+                self._refresh_at = self.expires_at - 300
                 
                 # Update session headers
-                self.session.headers.update({
-                    "Authorization": f"Bearer {self.access_token}"
-                })
+                self._apply_access_token(self.access_token)
                 
                 self._save_session()
                 logger.info("Successfully refreshed access token")
                 return True
             else:
-                logger.error(f"Failed to refresh token: {response.status_code} - {response.text}")
+                logger.error("Failed to refresh token: %s - %s", response.status_code, response.text[:512])
                 return False
         except Exception as e:
             logger.error(f"Error refreshing token: {e}")
             return False
     
+    def _finalize_login(self) -> bool:
+        """Follow the post-login redirect and exchange its code for tokens.
+
+        Shared tail of login() and complete_2fa(): both end by fetching
+        the redirect URL, extracting the authorization code, exchanging it
+        for OAuth tokens and persisting the session.
+
+        Returns:
+            bool: True if tokens were obtained and stored
+        """
+        redirect_response = self.session.get(self.REDIRECT_URL)
+        if not redirect_response.ok:
+            logger.error("Failed to get redirect: %s - %s",
+                         redirect_response.status_code, redirect_response.text[:512])
+            return False
+
+        redirect_data = _json_loads(redirect_response.content)
+        # parse_qs tolerates malformed or code-less redirect URLs, where
+        # the old split() chain raised IndexError
+        redirect_url = redirect_data.get('redirectUrl', '')
+        code = parse_qs(urlparse(redirect_url).query).get('code', [None])[0]
+        if not code:
+            logger.error(f"No authorization code in redirect URL: {redirect_url}")
+            return False
+
+        # Exchange code for tokens
+        token_data = {
+            "grant_type": "authorization_code",
+            "code": code,
+            "client_id": self.CLIENT_ID
+        }
+
+        token_response = self.session.post(
+            f"{self.OAUTH_URL}/token",
+            json=token_data
+        )
+
+        if not token_response.ok:
+            logger.error("Failed to get tokens: %s - %s",
+                         token_response.status_code, token_response.text[:512])
+            return False
+
+        token_info = _json_loads(token_response.content)
+        self.access_token = token_info.get('access_token')
+        self.refresh_token = token_info.get('refresh_token')
+        self.account_id = token_info.get('account_id')
+        self.expires_at = time.time() + token_info.get('expires_in', 28800)  # Default 8 hours
+        self._refresh_at = self.expires_at - 300
+
+        # Update session headers
+        self._apply_access_token(self.access_token)
+
+        self._save_session()
+        return True
+
     def login(self, username: str, password: str) -> Tuple[bool, Optional[str]]:
         """Log in to Epic Games account.
         
@@ -186,51 +459,20 @@ class EpicGamesClient:
                 json=login_data
             )
             
-            if response.status_code == 200:
-                login_response = response.json()
+            if response.ok:
+                login_response = _json_loads(response.content)
                 
                 # Check if 2FA is required
                 if login_response.get('twoFactorRequired', False):
                     logger.info(f"2FA required. Method: {login_response.get('method')}")
                     return False, login_response.get('method')
                 
-                # If no 2FA, proceed with redirect
-                redirect_response = self.session.get(self.REDIRECT_URL)
-                if redirect_response.status_code == 200:
-                    redirect_data = redirect_response.json()
-                    code = redirect_data.get('redirectUrl', '').split('code=')[1].split('&')[0]
-                    
-                    # Exchange code for tokens
-                    token_data = {
-                        "grant_type": "authorization_code",
-                        "code": code,
-                        "client_id": self.CLIENT_ID
-                    }
-                    
-                    token_response = self.session.post(
-                        f"{self.OAUTH_URL}/token",
-                        json=token_data
-                    )
-                    
-                    if token_response.status_code == 200:
-                        token_info = token_response.json()
-                        self.access_token = token_info.get('access_token')
-                        self.refresh_token = token_info.get('refresh_token')
-                        self.account_id = token_info.get('account_id')
-                        self.expires_at = time.time() + token_info.get('expires_in', 28800)  # Default 8 hours
-                        
-                        # Update session headers
-                        self.session.headers.update({
-                            "Authorization": f"Bearer {self.access_token}"
-                        })
-                        
-                        self._save_session()
-                        logger.info(f"Successfully logged in as {username}")
-                        return True, None
-                    else:
-                        logger.error(f"Failed to get tokens: {token_response.status_code} - {token_response.text}")
+                # If no 2FA, proceed with redirect and token exchange
+                if self._finalize_login():
+                    logger.info(f"Successfully logged in as {username}")
+                    return True, None
             else:
-                logger.error(f"Login failed: {response.status_code} - {response.text}")
+                logger.error("Login failed: %s - %s", response.status_code, response.text[:512])
             
             return False, None
         except Exception as e:
@@ -259,46 +501,13 @@ class EpicGamesClient:
                 json=data
             )
             
-            if response.status_code == 200:
-                # Follow redirect to get authorization code
-                redirect_response = self.session.get(self.REDIRECT_URL)
-                if redirect_response.status_code == 200:
-                    redirect_data = redirect_response.json()
-                    code = redirect_data.get('redirectUrl', '').split('code=')[1].split('&')[0]
-                    
-                    # Exchange code for tokens
-                    token_data = {
-                        "grant_type": "authorization_code",
-                        "code": code,
-                        "client_id": self.CLIENT_ID
-                    }
-                    
-                    token_response = self.session.post(
-                        f"{self.OAUTH_URL}/token",
-                        json=token_data
-                    )
-                    
-                    if token_response.status_code == 200:
-                        token_info = token_response.json()
-                        self.access_token = token_info.get('access_token')
-                        self.refresh_token = token_info.get('refresh_token')
-                        self.account_id = token_info.get('account_id')
-                        self.expires_at = time.time() + token_info.get('expires_in', 28800)  # Default 8 hours
-                        
-                        # Update session headers
-                        self.session.headers.update({
-                            "Authorization": f"Bearer {self.access_token}"
-                        })
-                        
-                        self._save_session()
-                        logger.info("2FA completed successfully")
-                        return True
-                    else:
-                        logger.error(f"Failed to get tokens after 2FA: {token_response.status_code} - {token_response.text}")
-                else:
-                    logger.error(f"Failed to get redirect after 2FA: {redirect_response.status_code} - {redirect_response.text}")
+            if response.ok:
+                # Follow redirect and exchange the code for tokens
+                if self._finalize_login():
+                    logger.info("2FA completed successfully")
+                    return True
             else:
-                logger.error(f"2FA verification failed: {response.status_code} - {response.text}")
+                logger.error("2FA verification failed: %s - %s", response.status_code, response.text[:512])
             
             return False
         except Exception as e:
@@ -331,49 +540,135 @@ class EpicGamesClient:
             logger.error("Authentication required to get free games")
             return []
         
+        now = time.time()
+        if self._free_games_cache and now - self._free_games_cache[0] < self._free_games_ttl:
+            logger.info("Using recently fetched free games list")
+            return self._free_games_cache[1]
+
         try:
-            # Get free games from Epic Games Store API
+            # Get free games from Epic Games Store API; the conditional
+            # header lets the server answer 304 when nothing changed
             params = {
                 "locale": "en-US",
                 "country": "US",
                 "allowCountries": "US"
             }
-            
-            response = self.session.get(self.FREE_GAMES_URL, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                free_games = []
-                
-                # Extract free games from the response
-                for item in data.get('data', {}).get('Catalog', {}).get('searchStore', {}).get('elements', []):
-                    # Check if the game is free and not already claimed
-                    if item.get('price', {}).get('totalPrice', {}).get('discountPrice', 0) == 0:
-                        game_id = item.get('id')
-                        title = item.get('title', 'Unknown Game')
-                        
-                        # Skip games that are already claimed
-                        if game_id in self.claimed_games:
-                            logger.info(f"Game '{title}' already claimed, skipping")
-                            continue
-                        
-                        free_games.append({
-                            'id': game_id,
-                            'title': title,
-                            'namespace': item.get('namespace'),
-                            'description': item.get('description'),
-                            'url': f"https://www.epicgames.com/store/en-US/p/{item.get('urlSlug')}"
-                        })
-                
-                logger.info(f"Found {len(free_games)} new free games")
+            headers = {}
+            if self._catalog_etag:
+                headers["If-None-Match"] = self._catalog_etag
+
+            response = self.session.get(
+                self.FREE_GAMES_URL, params=params, headers=headers, stream=True
+            )
+
+            if response.status_code == 304:
+                response.close()
+                logger.info("Free games catalog unchanged, using cached list")
+                free_games = self._filter_unclaimed(self._catalog_cached)
+                self._free_games_cache = (now, free_games)
+                return free_games
+
+            if response.ok:
+                all_free = self._parse_catalog(response)
+
+                # Cache the parsed (unfiltered) list so a later 304 can be
+                # re-filtered against the current claimed set
+                self._catalog_etag = response.headers.get('ETag')
+                self._catalog_cached = all_free
+                self._save_catalog_cache()
+
+                free_games = self._filter_unclaimed(all_free)
+                self._free_games_cache = (now, free_games)
+                logger.info("Found %d new free games", len(free_games))
                 return free_games
             else:
-                logger.error(f"Failed to get free games: {response.status_code} - {response.text}")
+                logger.error("Failed to get free games: %s - %s", response.status_code, response.text[:512])
                 return []
         except Exception as e:
             logger.error(f"Error getting free games: {e}")
             return []
+
+    def _parse_catalog(self, response) -> List[Dict[str, Any]]:
+        """Extract the free entries from a catalog response.
+
+        Streams the elements array with ijson when available, so only the
+        handful of retained fields per entry are materialized rather than
+        the whole multi-MB tree; falls back to a full-body parse.
+
+        Args:
+            response: Streaming response from the free games endpoint
+
+        Returns:
+            List of free game data dictionaries (not yet claim-filtered)
+        """
+        if ijson is not None:
+            # Let urllib3 undo the transfer encoding before ijson reads
+            response.raw.decode_content = True
+            elements = ijson.items(response.raw, 'data.Catalog.searchStore.elements.item')
+        else:
+            data = _json_loads(response.content)
+            elements = data.get('data', {}).get('Catalog', {}).get('searchStore', {}).get('elements', [])
+
+        # The loop runs once per catalog element, so avoid the chained
+        # .get(..., {}) calls that allocate a throwaway dict per miss and
+        # re-resolve the append method each iteration
+        all_free = []
+        append = all_free.append
+        for item in elements:
+            price = item.get('price')
+            total_price = price.get('totalPrice') if price else None
+            if total_price and total_price.get('discountPrice', 0) != 0:
+                continue
+            append({
+                'id': item.get('id'),
+                'title': item.get('title', 'Unknown Game'),
+                'namespace': item.get('namespace'),
+                'description': item.get('description'),
+                'url': f"https://www.epicgames.com/store/en-US/p/{item.get('urlSlug')}"
+            })
+        return all_free
+
+    def _filter_unclaimed(self, games: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop games whose IDs are already in the claimed set.
+
+        Args:
+            games: Parsed free game dictionaries
+
+        Returns:
+            List of games not yet claimed
+        """
+        claimed = self.claimed_games
+        # Checked once outside the loop: when INFO is disabled the loop
+        # does no logging work at all, not even argument formatting
+        log_skips = logger.isEnabledFor(logging.INFO)
+        unclaimed = []
+        for game in games:
+            if game.get('id') in claimed:
+                if log_skips:
+                    logger.info("Game '%s' already claimed, skipping", game.get('title'))
+                continue
+            unclaimed.append(game)
+        return unclaimed
     
+    def claim_games(self, games: List[Dict[str, Any]]) -> List[bool]:
+        """Claim multiple free games concurrently.
+
+        Each claim is an independent GraphQL mutation, so fanning them out
+        over threads bounds the wall-clock cost at roughly one round-trip;
+        the pooled session shares its keep-alive sockets across workers.
+
+        Args:
+            games: List of game data dictionaries from get_free_games()
+
+        Returns:
+            List of per-game success flags, in input order
+        """
+        if not games:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(8, len(games))) as executor:
+            return list(executor.map(self.claim_game, games))
+
     def claim_game(self, game: Dict[str, Any]) -> bool:
         """Claim a free game.
         
@@ -394,65 +689,211 @@ class EpicGamesClient:
         if not all([game_id, namespace, title]):
             logger.error(f"Missing required game information: {game}")
             return False
-        
+
+        # Callers can hand us a stale offer list; a set lookup here is far
+        # cheaper than the purchase round-trip it would trigger
+        if game_id in self.claimed_games:
+            logger.info("Game '%s' already claimed, skipping", title)
+            return True
+
         try:
-            # GraphQL mutation to purchase (claim) the game
-            query = """
-            mutation purchaseOrderMutation($orderPurchaseParams: OrderPurchaseParams!) {
-                purchaseOrder(orderPurchaseParams: $orderPurchaseParams) {
-                    orderResponse {
-                        orderResponseCode
-                        orderNumber
-                        orderComplete
-                        orderError
-                    }
-                }
-            }
-            """
-            
-            variables = {
-                "orderPurchaseParams": {
-                    "productId": game_id,
-                    "quantity": 1,
-                    "namespace": namespace,
+            response = self.session.post(
+                self.GRAPHQL_URL,
+                data=self._build_claim_payload(game_id, namespace)
+            )
+            return self._handle_claim_response(response, game_id, title)
+        except Exception as e:
+            logger.error(f"Error claiming game '{title}': {e}")
+            return False
+
+    def _claim_params(self, game_id: str, namespace: str) -> Dict[str, Any]:
+        """Build the OrderPurchaseParams dict for one game."""
+        return {
+            **self._CLAIM_PARAMS_TEMPLATE,
+            "productId": game_id,
+            "namespace": namespace,
+            "offerId": game_id,
+            "lineOffers": [
+                {
                     "offerId": game_id,
-                    "currency": "USD",
-                    "lineOffers": [
-                        {
-                            "offerId": game_id,
-                            "quantity": 1
-                        }
-                    ]
+                    "quantity": 1
                 }
-            }
-            
-            payload = {
-                "query": query,
-                "variables": variables
-            }
-            
+            ]
+        }
+
+    def _build_claim_payload(self, game_id: str, namespace: str) -> bytes:
+        """Serialize the claim mutation for one game.
+
+        Fills the per-game fields into the shared template; the
+        pre-serialized body skips the HTTP library's own json= encoding.
+        """
+        variables = {"orderPurchaseParams": self._claim_params(game_id, namespace)}
+        return _json_dumps({"query": self._CLAIM_QUERY, "variables": variables})
+
+    def claim_games_batched(self, games: List[Dict[str, Any]]) -> List[bool]:
+        """Claim several games with a single aliased GraphQL request.
+
+        GraphQL allows multiple root fields via aliases, so N claims ride
+        one HTTPS round-trip instead of N. Falls back to per-game requests
+        if the batched mutation fails.
+
+        Args:
+            games: List of game data dictionaries from get_free_games()
+
+        Returns:
+            List of per-game success flags, in input order
+        """
+        if not games:
+            return []
+        if len(games) == 1:
+            return [self.claim_game(games[0])]
+
+        if not self.ensure_authenticated():
+            logger.error("Authentication required to claim games")
+            return [False] * len(games)
+
+        var_defs = []
+        fields = []
+        variables = {}
+        for i, game in enumerate(games):
+            var_defs.append(f"$p{i}: OrderPurchaseParams!")
+            fields.append(
+                f"claim{i}: purchaseOrder(orderPurchaseParams: $p{i}) "
+                "{ orderResponse { orderResponseCode orderNumber orderComplete orderError } }"
+            )
+            variables[f"p{i}"] = self._claim_params(game.get('id'), game.get('namespace'))
+
+        query = f"mutation batchPurchase({', '.join(var_defs)}) {{ {' '.join(fields)} }}"
+
+        try:
             response = self.session.post(
                 self.GRAPHQL_URL,
-                json=payload
+                data=_json_dumps({"query": query, "variables": variables})
             )
-            
-            if response.status_code == 200:
-                result = response.json()
-                purchase_data = result.get('data', {}).get('purchaseOrder', {}).get('orderResponse', {})
-                
-                if purchase_data.get('orderComplete', False):
-                    # Add to claimed games list
-                    self.claimed_games.append(game_id)
-                    self._save_claimed_games()
-                    logger.info(f"Successfully claimed game: {title}")
-                    return True
-                else:
-                    error = purchase_data.get('orderError')
-                    logger.error(f"Failed to claim game '{title}': {error}")
-            else:
-                logger.error(f"Failed to claim game '{title}': {response.status_code} - {response.text}")
-            
+
+            if response.ok:
+                data = _json_loads(response.content).get('data') or {}
+                results = []
+                for i, game in enumerate(games):
+                    order = (data.get(f"claim{i}") or {}).get('orderResponse') or {}
+                    ok = order.get('orderComplete', False)
+                    if ok:
+                        with self._claimed_lock:
+                            self.claimed_games.add(game.get('id'))
+                            self._append_claimed_game(game.get('id'))
+                        logger.info(f"Successfully claimed game: {game.get('title')}")
+                    else:
+                        logger.error(
+                            f"Failed to claim game '{game.get('title')}': {order.get('orderError')}"
+                        )
+                    results.append(ok)
+
+                if any(results):
+                    self._free_games_cache = None
+                return results
+
+            logger.error("Batched claim failed: %s - %s", response.status_code, response.text[:512])
+        except Exception as e:
+            logger.error(f"Error in batched claim: {e}")
+
+        # One request per game still works when the endpoint rejects the
+        # aliased mutation
+        logger.info("Falling back to per-game claim requests")
+        return self.claim_games(games)
+
+    def _handle_claim_response(self, response, game_id: str, title: str) -> bool:
+        """Interpret a claim response and record a successful claim.
+
+        Works with both requests and httpx response objects.
+        """
+        # requests exposes .ok, httpx .is_success; the status code range
+        # is the one spelling both understand
+        if 200 <= response.status_code < 300:
+            result = _json_loads(response.content)
+            purchase_data = result.get('data', {}).get('purchaseOrder', {}).get('orderResponse', {})
+
+            if purchase_data.get('orderComplete', False):
+                # Record the claim; an O(1) set insert plus a one-line
+                # append instead of rewriting the whole list
+                with self._claimed_lock:
+                    self.claimed_games.add(game_id)
+                    self._append_claimed_game(game_id)
+                # The cached free list no longer reflects the claimed set
+                self._free_games_cache = None
+                logger.info(f"Successfully claimed game: {title}")
+                return True
+
+            error = purchase_data.get('orderError')
+            logger.error(f"Failed to claim game '{title}': {error}")
+        else:
+            logger.error("Failed to claim game '%s': %s - %s", title, response.status_code, response.text[:512])
+
+        return False
+
+    def _get_async_client(self):
+        """Return the shared httpx client, creating it on first use."""
+        if httpx is None:
+            raise RuntimeError("httpx is not installed")
+
+        if self._aclient is None:
+            limits = httpx.Limits(max_keepalive_connections=8, max_connections=32)
+            try:
+                # HTTP/2 lets concurrent claims share one TLS connection
+                self._aclient = httpx.AsyncClient(http2=True, limits=limits)
+            except ImportError:
+                # The h2 extra isn't installed; HTTP/1.1 still pools
+                self._aclient = httpx.AsyncClient(limits=limits)
+        return self._aclient
+
+    async def claim_game_async(self, game: Dict[str, Any]) -> bool:
+        """Claim a free game over the shared async client.
+
+        Args:
+            game: Game data dictionary from get_free_games()
+
+        Returns:
+            bool: True if game was successfully claimed
+        """
+        if not self.ensure_authenticated():
+            logger.error("Authentication required to claim games")
+            return False
+
+        game_id = game.get('id')
+        namespace = game.get('namespace')
+        title = game.get('title')
+
+        if not all([game_id, namespace, title]):
+            logger.error(f"Missing required game information: {game}")
             return False
+
+        # Carry over the session's end-to-end headers (Authorization,
+        # Content-Type, ...) but drop the hop-by-hop ones the HTTP/2
+        # framing layer refuses to send
+        headers = {
+            k: v for k, v in self.session.headers.items()
+            if k.lower() not in _HOP_BY_HOP
+        }
+
+        try:
+            response = await self._get_async_client().post(
+                self.GRAPHQL_URL,
+                content=self._build_claim_payload(game_id, namespace),
+                headers=headers
+            )
+            return self._handle_claim_response(response, game_id, title)
         except Exception as e:
             logger.error(f"Error claiming game '{title}': {e}")
             return False
+
+    async def claim_all(self, games: List[Dict[str, Any]]) -> List[bool]:
+        """Claim multiple games concurrently over the async client.
+
+        Args:
+            games: List of game data dictionaries from get_free_games()
+
+        Returns:
+            List of per-game success flags, in input order
+        """
+        if not games:
+            return []
+        return list(await asyncio.gather(*(self.claim_game_async(g) for g in games)))
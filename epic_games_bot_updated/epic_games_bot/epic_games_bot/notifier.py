@@ -3,13 +3,26 @@ Notification module for Epic Games Freebie Auto-Claimer Bot.
 Handles sending notifications via Telegram and Discord.
 """
 
-import os
 import logging
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional, List
 
+from epic_games_bot.config import get_config
+
 logger = logging.getLogger(__name__)
 
+# Shared HTTP session so repeated notifications reuse keep-alive connections
+# to api.telegram.org and the Discord webhook instead of paying a fresh
+# TCP+TLS handshake per message.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# Timeout (seconds) for outbound notification requests
+REQUEST_TIMEOUT = 10
+
 class TelegramNotifier:
     """Telegram notification handler."""
     
@@ -24,6 +37,16 @@ class TelegramNotifier:
         """
         self.token = token
         self.chat_id = chat_id
+
+        # Precompute the endpoint URL and the static payload fields so each
+        # send only fills in the message text
+        self._send_url = self.API_URL.format(token=token, method="sendMessage")
+        self._base_payload = {
+            "chat_id": chat_id,
+            "parse_mode": "HTML",
+            "disable_web_page_preview": False
+        }
+
         logger.info("Telegram notifier initialized")
     
     def send_message(self, message: str) -> bool:
@@ -36,21 +59,16 @@ class TelegramNotifier:
             bool: True if message was sent successfully
         """
         try:
-            url = self.API_URL.format(token=self.token, method="sendMessage")
-            payload = {
-                "chat_id": self.chat_id,
-                "text": message,
-                "parse_mode": "HTML",
-                "disable_web_page_preview": False
-            }
-            
-            response = requests.post(url, json=payload)
-            
-            if response.status_code == 200:
-                logger.info("Telegram message sent successfully")
-                return True
-            else:
-                logger.error(f"Failed to send Telegram message: {response.status_code} - {response.text}")
+            payload = {**self._base_payload, "text": message}
+
+            # The context manager returns the socket to the pool as soon as
+            # we're done with the response
+            with _SESSION.post(self._send_url, json=payload, timeout=REQUEST_TIMEOUT) as response:
+                if response.ok:
+                    logger.info("Telegram message sent successfully")
+                    return True
+                logger.error("Failed to send Telegram message: %s - %s",
+                             response.status_code, response.text[:500])
                 return False
         except Exception as e:
             logger.error(f"Error sending Telegram message: {e}")
@@ -69,13 +87,48 @@ class TelegramNotifier:
         url = game.get('url', 'https://www.epicgames.com/store/')
         description = game.get('description', 'No description available')
         
+        # Only truncate (and add an ellipsis) when the description is
+        # actually too long
+        short_desc = description if len(description) <= 100 else description[:100] + "…"
+
         message = (
             f"🎮 <b>Free Game Claimed!</b>\n\n"
             f"<b>{title}</b>\n"
-            f"{description[:100]}...\n\n"
+            f"{short_desc}\n\n"
             f"🔗 <a href='{url}'>View in Epic Games Store</a>"
         )
-        
+
+        return self.send_message(message)
+
+    def send_games_claimed_batch(self, games: List[Dict[str, Any]]) -> bool:
+        """Send a single notification covering multiple claimed games.
+
+        Args:
+            games: List of game data dictionaries
+
+        Returns:
+            bool: True if notification was sent successfully
+        """
+        if not games:
+            return False
+
+        blocks = []
+        for game in games:
+            title = game.get('title', 'Unknown Game')
+            url = game.get('url', 'https://www.epicgames.com/store/')
+            blocks.append(f"<b>{title}</b>\n🔗 <a href='{url}'>View in Epic Games Store</a>")
+
+        header = f"🎮 <b>{len(games)} Free Game(s) Claimed!</b>"
+        message = "\n\n".join([header] + blocks)
+
+        # Telegram messages are capped at 4096 characters. Cutting
+        # mid-string could split an <a> tag and get the whole message
+        # rejected as unparseable, so drop whole entries until it fits
+        while len(message) > 4000 and blocks:
+            blocks.pop()
+            omitted = len(games) - len(blocks)
+            message = "\n\n".join([header] + blocks + [f"… and {omitted} more"])
+
         return self.send_message(message)
 
 
@@ -106,13 +159,14 @@ class DiscordNotifier:
             if embeds:
                 payload["embeds"] = embeds
             
-            response = requests.post(self.webhook_url, json=payload)
-            
-            if response.status_code == 204:
-                logger.info("Discord message sent successfully")
-                return True
-            else:
-                logger.error(f"Failed to send Discord message: {response.status_code} - {response.text}")
+            # response.ok covers the whole 2xx range, so the webhook's 204
+            # is handled the same way as Telegram's 200
+            with _SESSION.post(self.webhook_url, json=payload, timeout=REQUEST_TIMEOUT) as response:
+                if response.ok:
+                    logger.info("Discord message sent successfully")
+                    return True
+                logger.error("Failed to send Discord message: %s - %s",
+                             response.status_code, response.text[:500])
                 return False
         except Exception as e:
             logger.error(f"Error sending Discord message: {e}")
@@ -133,102 +187,163 @@ class DiscordNotifier:
         
         embed = {
             "title": title,
-            "description": description[:200] + "..." if len(description) > 200 else description,
+            "description": description if len(description) <= 200 else description[:200] + "…",
             "url": url,
             "color": 5814783,  # Epic Games blue
             "footer": {
                 "text": "Epic Games Freebie Auto-Claimer"
             },
-            "timestamp": f"{__import__('datetime').datetime.utcnow().isoformat()}Z"
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }
         
         return self.send_message("🎮 **Free Game Claimed!**", [embed])
 
+    def send_games_claimed_batch(self, games: List[Dict[str, Any]]) -> bool:
+        """Send a single notification covering multiple claimed games.
+
+        Discord webhooks accept at most 10 embeds per POST, so larger
+        batches are split across multiple requests.
+
+        Args:
+            games: List of game data dictionaries
+
+        Returns:
+            bool: True if at least one notification was sent successfully
+        """
+        if not games:
+            return False
+
+        embeds = []
+        for game in games:
+            description = game.get('description', 'No description available')
+            embeds.append({
+                "title": game.get('title', 'Unknown Game'),
+                "description": description if len(description) <= 200 else description[:200] + "…",
+                "url": game.get('url', 'https://www.epicgames.com/store/'),
+                "color": 5814783,  # Epic Games blue
+                "footer": {
+                    "text": "Epic Games Freebie Auto-Claimer"
+                }
+            })
+
+        success = False
+        for i in range(0, len(embeds), 10):
+            sent = self.send_message(
+                f"🎮 **{len(games)} Free Game(s) Claimed!**" if i == 0 else "",
+                embeds[i:i + 10]
+            )
+            success = success or sent
+
+        return success
+
 
 class NotificationManager:
     """Manages multiple notification channels."""
-    
+
+    STARTUP_MESSAGE = "🚀 Epic Games Freebie Auto-Claimer Bot started!"
+
+
     def __init__(self):
         """Initialize notification manager."""
         self.telegram_notifier = None
         self.discord_notifier = None
+
+        # Shared pool so Telegram and Discord sends overlap instead of
+        # paying both HTTP round-trips back to back
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="notify")
         
+        config = get_config()
+
         # Initialize Telegram notifier if credentials are available
-        telegram_token = os.environ.get('TELEGRAM_BOT_TOKEN')
-        telegram_chat_id = os.environ.get('TELEGRAM_CHAT_ID')
-        if telegram_token and telegram_chat_id:
-            self.telegram_notifier = TelegramNotifier(telegram_token, telegram_chat_id)
+        telegram_chat_id = config.telegram_chat_ids[0] if config.telegram_chat_ids else None
+        if config.telegram_token and telegram_chat_id:
+            self.telegram_notifier = TelegramNotifier(config.telegram_token, telegram_chat_id)
             logger.info("Telegram notifications enabled")
-        
+
         # Initialize Discord notifier if webhook URL is available
-        discord_webhook = os.environ.get('DISCORD_WEBHOOK_URL')
+        discord_webhook = config.discord_webhook_url
         if discord_webhook:
             self.discord_notifier = DiscordNotifier(discord_webhook)
             logger.info("Discord notifications enabled")
         
-        if not self.telegram_notifier and not self.discord_notifier:
+        # Lets the send_* methods bail out before building any message
+        # strings when notifications aren't configured at all
+        self._has_channels = bool(self.telegram_notifier or self.discord_notifier)
+        if not self._has_channels:
             logger.warning("No notification channels configured")
     
+    def _fan_out(self, method_name: str, *args) -> bool:
+        """Call the named method on all configured notifiers concurrently.
+
+        Args:
+            method_name: Name of the notifier method to call
+            *args: Arguments to pass to the method
+
+        Returns:
+            bool: True if at least one notification was sent successfully
+        """
+        futures = [
+            self._pool.submit(getattr(notifier, method_name), *args)
+            for notifier in (self.telegram_notifier, self.discord_notifier)
+            if notifier
+        ]
+        results = []
+        for future in futures:
+            # A slow or broken channel counts as its send failing; the
+            # send_* methods must return bool, never raise, or a failed
+            # notification would abort the caller's claim loop
+            try:
+                results.append(future.result(timeout=30))
+            except Exception as e:
+                logger.error("Notification channel %s failed: %s", method_name, e)
+                results.append(False)
+        return any(results)
+
     def send_game_claimed_notification(self, game: Dict[str, Any]) -> bool:
         """Send notification about claimed game to all configured channels.
-        
+
         Args:
             game: Game data dictionary
-            
+
         Returns:
             bool: True if at least one notification was sent successfully
         """
-        success = False
-        
-        if self.telegram_notifier:
-            telegram_success = self.telegram_notifier.send_game_claimed_notification(game)
-            success = success or telegram_success
-        
-        if self.discord_notifier:
-            discord_success = self.discord_notifier.send_game_claimed_notification(game)
-            success = success or discord_success
-        
-        return success
-    
+        if not self._has_channels:
+            return False
+        return self._fan_out('send_game_claimed_notification', game)
+
+    def send_games_claimed_batch(self, games: List[Dict[str, Any]]) -> bool:
+        """Send one combined claimed-games notification to all configured channels.
+
+        Args:
+            games: List of game data dictionaries
+
+        Returns:
+            bool: True if at least one notification was sent successfully
+        """
+        if not self._has_channels:
+            return False
+        return self._fan_out('send_games_claimed_batch', games)
+
     def send_error_notification(self, error_message: str) -> bool:
         """Send error notification to all configured channels.
-        
+
         Args:
             error_message: Error message to send
-            
+
         Returns:
             bool: True if at least one notification was sent successfully
         """
-        success = False
-        
-        message = f"❌ **Error**: {error_message}"
-        
-        if self.telegram_notifier:
-            telegram_success = self.telegram_notifier.send_message(message)
-            success = success or telegram_success
-        
-        if self.discord_notifier:
-            discord_success = self.discord_notifier.send_message(message)
-            success = success or discord_success
-        
-        return success
-    
+        if not self._has_channels:
+            return False
+        return self._fan_out('send_message', f"❌ **Error**: {error_message}")
+
     def send_startup_notification(self) -> bool:
         """Send startup notification to all configured channels.
-        
+
         Returns:
             bool: True if at least one notification was sent successfully
         """
-        success = False
-        
-        message = "🚀 Epic Games Freebie Auto-Claimer Bot started!"
-        
-        if self.telegram_notifier:
-            telegram_success = self.telegram_notifier.send_message(message)
-            success = success or telegram_success
-        
-        if self.discord_notifier:
-            discord_success = self.discord_notifier.send_message(message)
-            success = success or discord_success
-        
-        return success
+        if not self._has_channels:
+            return False
+        return self._fan_out('send_message', self.STARTUP_MESSAGE)
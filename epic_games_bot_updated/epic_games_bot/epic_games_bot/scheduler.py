@@ -3,32 +3,77 @@ Scheduler module for Epic Games Freebie Auto-Claimer Bot.
 Handles scheduling of periodic tasks.
 """
 
+import asyncio
 import logging
-from datetime import datetime, timedelta
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
-from apscheduler.triggers.interval import IntervalTrigger
+import threading
+
+# Must run before __init__ creates the shared loop below: the app builds
+# the scheduler (and thus the loop every component runs on) before the
+# Telegram bot module is even imported, so installing uvloop only there
+# would come too late. Optional, like the twin block in telegram_bot.py.
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
 
 logger = logging.getLogger(__name__)
 
 class Scheduler:
     """Task scheduler for Epic Games Freebie Auto-Claimer Bot."""
-    
+
     def __init__(self):
-        """Initialize scheduler."""
-        self.scheduler = BackgroundScheduler()
+        """Initialize scheduler.
+
+        Jobs live in memory only: every job this app registers is a bound
+        method of the application object, which no persistent store can
+        pickle. Missed runs across restarts are covered by the immediate
+        check-and-claim job the app schedules on every startup.
+        """
+        # Imported here rather than at module scope so importing this
+        # module stays cheap; apscheduler pulls in tzlocal and friends
+        from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+        # Run jobs on an asyncio event loop so network-bound jobs overlap,
+        # and coalesce misfires so a missed daily run (sleeping laptop)
+        # produces one catch-up execution instead of a pileup
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = None
+
+        self.scheduler = AsyncIOScheduler(
+            event_loop=self._loop,
+            job_defaults={
+                'coalesce': True,
+                'misfire_grace_time': 3600,
+                'max_instances': 1
+            }
+        )
         logger.info("Scheduler initialized")
-    
+
+    @property
+    def loop(self):
+        """The asyncio event loop the scheduler runs on.
+
+        Shared with other components (e.g. the Telegram bot) so the whole
+        application multiplexes its I/O on a single loop.
+        """
+        return self._loop
+
     def start(self):
         """Start the scheduler."""
         if not self.scheduler.running:
+            self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+            self._loop_thread.start()
             self.scheduler.start()
             logger.info("Scheduler started")
-    
+
     def shutdown(self):
         """Shutdown the scheduler."""
         if self.scheduler.running:
-            self.scheduler.shutdown()
+            self.scheduler.shutdown(wait=False)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            if self._loop_thread:
+                self._loop_thread.join(timeout=5)
             logger.info("Scheduler shutdown")
     
     def add_daily_job(self, job_func, hour=12, minute=0, name=None):
@@ -43,14 +88,20 @@ class Scheduler:
         Returns:
             Job ID
         """
+        from apscheduler.triggers.cron import CronTrigger
+
         trigger = CronTrigger(hour=hour, minute=minute)
+        job_name = name or job_func.__name__
         job_id = self.scheduler.add_job(
             job_func,
             trigger=trigger,
-            name=name or job_func.__name__
+            id=job_name,
+            name=job_name,
+            replace_existing=True,
+            misfire_grace_time=86400
         ).id
-        
-        logger.info(f"Added daily job '{name or job_func.__name__}' to run at {hour:02d}:{minute:02d}")
+
+        logger.info(f"Added daily job '{job_name}' to run at {hour:02d}:{minute:02d}")
         return job_id
     
     def add_interval_job(self, job_func, hours=24, minutes=0, seconds=0, name=None):
@@ -66,22 +117,29 @@ class Scheduler:
         Returns:
             Job ID
         """
+        from apscheduler.triggers.interval import IntervalTrigger
+
         trigger = IntervalTrigger(hours=hours, minutes=minutes, seconds=seconds)
+        job_name = name or job_func.__name__
         job_id = self.scheduler.add_job(
             job_func,
             trigger=trigger,
-            name=name or job_func.__name__
+            id=job_name,
+            name=job_name,
+            replace_existing=True
         ).id
-        
-        interval_str = ""
-        if hours > 0:
-            interval_str += f"{hours} hour(s) "
-        if minutes > 0:
-            interval_str += f"{minutes} minute(s) "
-        if seconds > 0:
-            interval_str += f"{seconds} second(s)"
-        
-        logger.info(f"Added interval job '{name or job_func.__name__}' to run every {interval_str.strip()}")
+
+        # Only build the human-readable interval string if it will be logged
+        if logger.isEnabledFor(logging.INFO):
+            interval_str = ""
+            if hours > 0:
+                interval_str += f"{hours} hour(s) "
+            if minutes > 0:
+                interval_str += f"{minutes} minute(s) "
+            if seconds > 0:
+                interval_str += f"{seconds} second(s)"
+
+            logger.info(f"Added interval job '{job_name}' to run every {interval_str.strip()}")
         return job_id
     
     def add_immediate_job(self, job_func, name=None):
@@ -94,12 +152,13 @@ class Scheduler:
         Returns:
             Job ID
         """
+        job_name = name or job_func.__name__
         job_id = self.scheduler.add_job(
             job_func,
-            name=name or job_func.__name__
+            name=job_name
         ).id
-        
-        logger.info(f"Added immediate job '{name or job_func.__name__}'")
+
+        logger.info(f"Added immediate job '{job_name}'")
         return job_id
     
     def remove_job(self, job_id):
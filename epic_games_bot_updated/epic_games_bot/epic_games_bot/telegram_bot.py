@@ -5,15 +5,24 @@ Updated for python-telegram-bot v20+
 """
 
 import os
+import re
+import functools
+import time
+import pathlib
 import logging
 import asyncio
 import threading
-from typing import Dict, Any, Optional, Callable, List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Final, Optional, Callable, List
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.constants import ParseMode
+from telegram.error import RetryAfter
+from telegram.request import HTTPXRequest
 from telegram.ext import (
     Application,
+    ApplicationHandlerStop,
     CommandHandler,
     MessageHandler,
     CallbackContext,
@@ -21,52 +30,296 @@ from telegram.ext import (
     CallbackQueryHandler,
     ConversationHandler,
     ContextTypes,
+    TypeHandler,
 )
 
+# orjson decodes Bot API responses (every getUpdates long-poll result,
+# every sendMessage echo) in C; optional with the same fallback shape as
+# in epic.py
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# uvloop replaces asyncio's Python-level event loop with libuv's C
+# implementation, speeding up the task/socket churn of the send fan-outs
+# and PTB's update processing; purely optional, like orjson in epic.py.
+# In the full app the shared loop is created by scheduler.py, which
+# installs uvloop itself; this block covers the bot used standalone.
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 logger = logging.getLogger(__name__)
 
 # Conversation states
 AWAITING_2FA = 1
 
+# Static command replies, built once at import instead of on every call
+_START_TEXT: Final = (
+    "🎮 *Epic Games Freebie Auto-Claimer Bot* 🎮\n\n"
+    "Welcome! This bot helps you claim free games from the Epic Games Store.\n\n"
+    "Use /help to see available commands."
+)
+
+_HELP_TEXT: Final = (
+    "🎮 *Epic Games Freebie Auto-Claimer Bot Commands* 🎮\n\n"
+    "*Available Commands:*\n"
+    "/start - Start the bot\n"
+    "/help - Show this help message\n"
+    "/status - Check bot status\n"
+    "/check - Check for new free games\n"
+    "/claim - Manually claim all available free games\n"
+    "/tfa - Enter 2FA code when prompted\n"
+    "/cancel - Cancel current operation"
+)
+
+_STATUS_HEADER: Final = "🎮 *Epic Games Freebie Auto-Claimer Status* 🎮\n\n"
+
+_NOT_AUTHORIZED: Final = "You are not authorized to use this bot."
+_NO_EPIC_CLIENT: Final = "Epic Games client not connected to bot."
+_NO_2FA_PENDING: Final = "No 2FA request pending."
+
+# Fallback title, shared instead of re-allocated per lookup
+_UNKNOWN: Final = "Unknown Game"
+
+# Resolved once so the send path skips the enum attribute lookup
+_MD: Final = ParseMode.MARKDOWN
+
+# Characters Telegram's (legacy) Markdown parser treats as markup; a game
+# title containing a bare '_' or '*' would otherwise 400 the whole send.
+# Compiled once so escaping a title is a single C-level substitution.
+_MD_ESCAPE_RE: Final = re.compile(r'([_*`\[])')
+
+
+def _escape_md(text: str) -> str:
+    """Escape Markdown control characters in untrusted text."""
+    return _MD_ESCAPE_RE.sub(r'\\\1', text)
+
+
+class _TelegramRequest(HTTPXRequest):
+    """HTTPXRequest that decodes Bot API payloads with orjson."""
+
+    def parse_json_payload(self, payload: bytes):
+        if orjson is None:
+            return super().parse_json_payload(payload)
+        return orjson.loads(payload)
+
+
+def _requires_auth(need_epic: bool = False, conversation: bool = False):
+    """Decorate a handler with the shared authorization preamble.
+
+    Every handler used to open with the same authorized-chat check and,
+    for most, an epic_client None-check; this factory runs both before
+    the wrapped handler.
+
+    Args:
+        need_epic: Also require a connected Epic Games client
+        conversation: Return ConversationHandler.END instead of None when
+            rejecting, so conversation-state handlers exit cleanly
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(self, update, context):
+            rejected = ConversationHandler.END if conversation else None
+            if not self._is_authorized(update):
+                # No reply: answering strangers costs a sendMessage round-trip
+                # each and lets them steer the bot into Telegram's flood limits
+                logger.debug("Ignoring update from unauthorized chat %s",
+                             update.effective_chat.id)
+                return rejected
+            if need_epic and not self.epic_client:
+                await self._reply(update, _NO_EPIC_CLIENT)
+                return rejected
+            return await handler(self, update, context)
+        return wrapper
+    return decorator
+
 class TelegramBot:
     """Interactive Telegram bot for Epic Games Freebie Auto-Claimer."""
-    
-    def __init__(self, token: str, authorized_chat_ids: List[str], epic_client=None, notifier=None):
+
+    # No per-instance __dict__: attribute reads on hot paths like the
+    # per-update authorization check become C-level slot loads, and each
+    # instance drops the dict's memory overhead
+    __slots__ = (
+        "token",
+        "webhook_url",
+        "webhook_port",
+        "authorized_chat_ids",
+        "_authorized_set",
+        "epic_client",
+        "notifier",
+        "_loop",
+        "_owns_loop",
+        "_loop_thread",
+        "tfa_callback",
+        "_tfa_lock",
+        "_executor",
+        "_auth_ok_until",
+        "_auth_ttl",
+        "_auth_file",
+        "_global_send_times",
+        "_per_chat_last",
+        "_free_games_cache",
+        "_free_games_ttl",
+        "_last_error_reply",
+        "application",
+        "_bot",
+    )
+
+    # The /tfa cancel keyboard never changes; build it once instead of
+    # re-allocating button, row and markup objects per prompt
+    _CANCEL_2FA_MARKUP = InlineKeyboardMarkup(
+        [[InlineKeyboardButton("Cancel", callback_data="cancel_2fa")]]
+    )
+
+    def __init__(self, token: str, authorized_chat_ids: List[str], epic_client=None, notifier=None,
+                 loop: Optional[asyncio.AbstractEventLoop] = None,
+                 webhook_url: Optional[str] = None, webhook_port: int = 8443):
         """Initialize Telegram bot.
-        
+
         Args:
             token: Telegram bot token
             authorized_chat_ids: List of authorized chat IDs
             epic_client: Epic Games client instance
             notifier: Notification manager instance
+            loop: Shared asyncio event loop to run on. When provided, the
+                bot polls and sends on this loop instead of spinning up its
+                own loop per operation.
+            webhook_url: Public base URL for webhook delivery. When set,
+                updates are pushed by Telegram instead of fetched by long
+                polling, removing the getUpdates round-trip per command.
+            webhook_port: Local port the webhook server listens on.
         """
         self.token = token
+        self.webhook_url = webhook_url
+        self.webhook_port = webhook_port
         self.authorized_chat_ids = [str(chat_id) for chat_id in authorized_chat_ids]
+        # O(1) membership for the per-update authorization check; the list
+        # above is kept for broadcast iteration order. Numeric IDs are
+        # stored in int form too, so the check hashes the update's raw
+        # integer chat ID without a str() allocation per update.
+        ids = set(self.authorized_chat_ids)
+        for chat_id in self.authorized_chat_ids:
+            try:
+                ids.add(int(chat_id))
+            except ValueError:
+                pass
+        self._authorized_set = frozenset(ids)
         self.epic_client = epic_client
         self.notifier = notifier
-        
-        # For storing 2FA callbacks
+
+        # One long-lived event loop for everything the bot does. Without
+        # it, each synchronous send spun up a fresh loop (and with it a
+        # fresh HTTPX pool inside Application.bot) via asyncio.run; a
+        # persistent loop keeps the keep-alive connections to
+        # api.telegram.org warm across sends. When the caller shares a
+        # loop (the scheduler's), that one is reused; otherwise the bot
+        # owns a loop driven by a daemon thread started in start().
+        if loop is not None:
+            self._loop = loop
+            self._owns_loop = False
+            self._loop_thread = None
+        else:
+            self._loop = asyncio.new_event_loop()
+            self._owns_loop = True
+            self._loop_thread = threading.Thread(
+                target=self._loop.run_forever, daemon=True, name="telegram-bot-loop"
+            )
+
+        # For storing 2FA callbacks. The lock makes the take-and-clear in
+        # _process_2fa_code atomic now that updates run concurrently; two
+        # chats submitting codes at once would otherwise both invoke it
         self.tfa_callback = None
-        
-        # Initialize bot
-        self.application = Application.builder().token(token).build()
+        self._tfa_lock = asyncio.Lock()
+
+        # Bounded pool for blocking Epic client calls; reuses warm threads
+        # and caps concurrent requests against the shared HTTP session
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="epic-bot")
+
+        # Cache the authenticated verdict briefly so bursts of commands
+        # (/check right before /claim) don't re-validate the session each time
+        self._auth_ok_until = 0.0
+        self._auth_ttl = 120
+
+        # The verdict also survives restarts as a marker file whose mtime
+        # is the last successful check, so a deploy doesn't force a fresh
+        # multi-RTT auth when the session is still warm
+        self._auth_file = pathlib.Path(
+            os.environ.get("EPIC_BOT_STATE", "~/.epic_bot/auth_ok")
+        ).expanduser()
+        try:
+            age = time.time() - self._auth_file.stat().st_mtime
+            if age < self._auth_ttl:
+                self._auth_ok_until = time.monotonic() + (self._auth_ttl - age)
+        except OSError:
+            pass
+
+        # Token buckets for Telegram's rate limits (~30 msg/s global,
+        # 1 msg/s per chat); staying under them is cheaper than eating a
+        # 429 and its retry_after backoff
+        self._global_send_times = deque(maxlen=25)
+        self._per_chat_last: Dict[str, float] = {}
+
+        # Short-lived cache for the free games list, so /check followed by
+        # /claim costs one catalog request instead of two
+        self._free_games_cache: Optional[tuple] = None
+        self._free_games_ttl = 60
+
+        # Per-chat timestamp of the last error reply, so an error loop
+        # doesn't hammer sendMessage into the flood limits
+        self._last_error_reply: Dict[int, float] = {}
+        
+        # Initialize bot. The default HTTPX pool holds one connection;
+        # concurrent sends (broadcasts, claim progress) would serialize on
+        # pool acquisition. Size it for the throttle's burst ceiling and
+        # give long polling its own dedicated connection so getUpdates
+        # never competes with sendMessage for a socket.
+        self.application = (
+            Application.builder()
+            .token(token)
+            # Process independent updates in parallel tasks; without this a
+            # multi-minute /claim from one chat queues /status from another
+            .concurrent_updates(True)
+            .request(_TelegramRequest(
+                connection_pool_size=32,
+                pool_timeout=30.0,
+                connect_timeout=10.0,
+                read_timeout=30.0,
+            ))
+            .get_updates_request(_TelegramRequest(
+                connection_pool_size=1,
+                connect_timeout=10.0,
+                read_timeout=30.0,
+            ))
+            .build()
+        )
+        # Bound once so the send path doesn't re-walk application.bot on
+        # every message
+        self._bot = self.application.bot
         
         # Register handlers
         self._register_handlers()
         
-        # For running the bot in a separate thread
-        self.bot_thread = None
-        
         logger.info("Telegram bot initialized")
     
     def _register_handlers(self):
         """Register command and message handlers."""
-        # Command handlers
-        self.application.add_handler(CommandHandler("start", self._start_command))
-        self.application.add_handler(CommandHandler("help", self._help_command))
-        self.application.add_handler(CommandHandler("status", self._status_command))
-        self.application.add_handler(CommandHandler("check", self._check_command))
-        self.application.add_handler(CommandHandler("claim", self._claim_command))
+        # Drop updates from unauthorized chats before any command parsing
+        # or handler dispatch happens; the per-handler decorator stays as
+        # a second line of defense
+        self.application.add_handler(TypeHandler(Update, self._unauth_gate), group=-1)
+
+        # Command handlers. block=False (v20's counterpart to the old
+        # run_async) stops a slow handler from stalling every other update;
+        # /status blocked on an Epic auth round-trip otherwise.
+        self.application.add_handler(CommandHandler("start", self._start_command, block=False))
+        self.application.add_handler(CommandHandler("help", self._help_command, block=False))
+        self.application.add_handler(CommandHandler("status", self._status_command, block=False))
+        self.application.add_handler(CommandHandler("check", self._check_command, block=False))
+        self.application.add_handler(CommandHandler("claim", self._claim_command, block=False))
         
         # 2FA conversation handler
         tfa_conv_handler = ConversationHandler(
@@ -81,6 +334,22 @@ class TelegramBot:
         # Error handler
         self.application.add_error_handler(self._error_handler)
     
+    async def _unauth_gate(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Silently drop updates from unauthorized chats.
+
+        Runs in a negative handler group, so rejected updates never reach
+        the command handlers and cost no outbound I/O.
+
+        Args:
+            update: Telegram update object
+            context: Callback context
+        """
+        chat = update.effective_chat
+        if chat is None or not self._is_authorized(update):
+            logger.debug("Dropping update from unauthorized chat %s",
+                         chat.id if chat else None)
+            raise ApplicationHandlerStop
+
     def _is_authorized(self, update: Update) -> bool:
         """Check if the user is authorized to use the bot.
         
@@ -90,9 +359,66 @@ class TelegramBot:
         Returns:
             bool: True if user is authorized
         """
-        chat_id = str(update.effective_chat.id)
-        return chat_id in self.authorized_chat_ids
-    
+        return update.effective_chat.id in self._authorized_set
+
+    async def _reply(self, update: Update, text: str, md: bool = False):
+        """Reply to the incoming message.
+
+        Args:
+            update: Telegram update object
+            text: Reply text
+            md: Whether to parse the text as Markdown
+        """
+        await update.message.reply_text(text, parse_mode=_MD if md else None)
+
+    def _ensure_authenticated_cached(self) -> bool:
+        """Check authentication, reusing a recent positive verdict.
+
+        Returns:
+            bool: True if the Epic client is authenticated
+        """
+        now = time.monotonic()
+        if now < self._auth_ok_until:
+            return True
+
+        ok = self.epic_client.ensure_authenticated()
+        if ok:
+            self._auth_ok_until = now + self._auth_ttl
+            try:
+                self._auth_file.parent.mkdir(parents=True, exist_ok=True)
+                self._auth_file.touch()
+            except OSError as e:
+                logger.warning("Could not persist auth marker: %s", e)
+        else:
+            self._drop_auth_marker()
+        return ok
+
+    def _drop_auth_marker(self):
+        """Forget the cached auth verdict, in memory and on disk."""
+        self._auth_ok_until = 0.0
+        try:
+            self._auth_file.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def _cached_free_games(self):
+        """Get the free games list, reusing a recent result.
+
+        The Epic catalog is account-invariant and rotates weekly, so a
+        sub-minute TTL is safe.
+
+        Returns:
+            List of free game data dictionaries
+        """
+        now = time.monotonic()
+        if self._free_games_cache and now - self._free_games_cache[0] < self._free_games_ttl:
+            return self._free_games_cache[1]
+
+        games = self.epic_client.get_free_games()
+        self._free_games_cache = (now, games)
+        return games
+
+    @_requires_auth()
     async def _start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command.
         
@@ -100,17 +426,9 @@ class TelegramBot:
             update: Telegram update object
             context: Callback context
         """
-        if not self._is_authorized(update):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-        
-        await update.message.reply_text(
-            "🎮 *Epic Games Freebie Auto-Claimer Bot* 🎮\n\n"
-            "Welcome! This bot helps you claim free games from the Epic Games Store.\n\n"
-            "Use /help to see available commands.",
-            parse_mode=ParseMode.MARKDOWN
-        )
+        await self._reply(update, _START_TEXT, md=True)
     
+    @_requires_auth()
     async def _help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /help command.
         
@@ -118,23 +436,9 @@ class TelegramBot:
             update: Telegram update object
             context: Callback context
         """
-        if not self._is_authorized(update):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-        
-        await update.message.reply_text(
-            "🎮 *Epic Games Freebie Auto-Claimer Bot Commands* 🎮\n\n"
-            "*Available Commands:*\n"
-            "/start - Start the bot\n"
-            "/help - Show this help message\n"
-            "/status - Check bot status\n"
-            "/check - Check for new free games\n"
-            "/claim - Manually claim all available free games\n"
-            "/tfa - Enter 2FA code when prompted\n"
-            "/cancel - Cancel current operation",
-            parse_mode=ParseMode.MARKDOWN
-        )
+        await self._reply(update, _HELP_TEXT, md=True)
     
+    @_requires_auth(need_epic=True)
     async def _status_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /status command.
         
@@ -142,30 +446,24 @@ class TelegramBot:
             update: Telegram update object
             context: Callback context
         """
-        if not self._is_authorized(update):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-        
-        if not self.epic_client:
-            await update.message.reply_text("Epic Games client not connected to bot.")
-            return
-        
-        # Check authentication status
-        is_authenticated = self.epic_client.ensure_authenticated()
-        
-        status_message = "🎮 *Epic Games Freebie Auto-Claimer Status* 🎮\n\n"
-        
-        if is_authenticated:
-            status_message += "✅ *Authentication:* Logged in\n"
-        else:
-            status_message += "❌ *Authentication:* Not logged in\n"
-        
-        # Add claimed games count
-        claimed_count = len(self.epic_client.claimed_games)
-        status_message += f"🎯 *Claimed Games:* {claimed_count}\n"
-        
-        await update.message.reply_text(status_message, parse_mode=ParseMode.MARKDOWN)
+        # Check authentication status; on a cold cache this is blocking
+        # HTTP against Epic, so route it through the executor like
+        # /check and /claim do
+        is_authenticated = await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._ensure_authenticated_cached
+        )
+
+        # Built as a list and joined once, like the check/claim messages
+        parts = [
+            _STATUS_HEADER,
+            "✅ *Authentication:* Logged in\n" if is_authenticated
+            else "❌ *Authentication:* Not logged in\n",
+            f"🎯 *Claimed Games:* {len(self.epic_client.claimed_games)}\n",
+        ]
+
+        await self._reply(update, "".join(parts), md=True)
     
+    @_requires_auth(need_epic=True)
     async def _check_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /check command.
         
@@ -173,65 +471,66 @@ class TelegramBot:
             update: Telegram update object
             context: Callback context
         """
-        if not self._is_authorized(update):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-        
-        if not self.epic_client:
-            await update.message.reply_text("Epic Games client not connected to bot.")
-            return
-        
-        await update.message.reply_text("🔍 Checking for free games... This may take a moment.")
-        
-        # Run in a separate thread to avoid blocking
-        threading.Thread(target=self._check_free_games_thread, args=(update.effective_chat.id,)).start()
-    
-    def _check_free_games_thread(self, chat_id: int):
-        """Check for free games in a separate thread.
-        
+        await self._reply(update, "🔍 Checking for free games... This may take a moment.")
+
+        # The handler is registered with block=False, so awaiting here
+        # doesn't stall other updates; exceptions reach the error handler
+        # instead of dying in a detached task
+        await self._check_free_games(update.effective_chat.id)
+
+    async def _check_free_games(self, chat_id: int):
+        """Check for free games and report the result.
+
         Args:
             chat_id: Telegram chat ID to send results to
         """
+        # Bound once; each is dereferenced several times below
+        send = self._send_message
         try:
+            loop = asyncio.get_running_loop()
+
             # Ensure authenticated
-            if not self.epic_client.ensure_authenticated():
-                asyncio.run(self._send_message(
+            if not await loop.run_in_executor(self._executor, self._ensure_authenticated_cached):
+                await send(
                     chat_id=chat_id,
                     text="❌ Not authenticated. Please log in first."
-                ))
+                )
                 return
-            
+
             # Get free games
-            free_games = self.epic_client.get_free_games()
-            
+            free_games = await loop.run_in_executor(self._executor, self._cached_free_games)
+
             if not free_games:
-                asyncio.run(self._send_message(
+                await send(
                     chat_id=chat_id,
                     text="✅ No new free games available to claim."
-                ))
+                )
                 return
-            
-            # Send list of free games
-            message = f"🎮 *Found {len(free_games)} new free game(s):*\n\n"
-            
-            for i, game in enumerate(free_games, 1):
-                title = game.get('title', 'Unknown Game')
-                message += f"{i}. *{title}*\n"
-            
-            message += "\nUse /claim to claim these games."
-            
-            asyncio.run(self._send_message(
+
+            # Send list of free games; one join instead of quadratic +=
+            lines = [
+                f"{i}. *{_escape_md(game.get('title', _UNKNOWN))}*"
+                for i, game in enumerate(free_games, 1)
+            ]
+            message = (
+                f"🎮 *Found {len(free_games)} new free game(s):*\n\n"
+                + "\n".join(lines)
+                + "\n\nUse /claim to claim these games."
+            )
+
+            await send(
                 chat_id=chat_id,
                 text=message,
                 parse_mode=ParseMode.MARKDOWN
-            ))
+            )
         except Exception as e:
-            logger.error(f"Error checking free games: {e}")
-            asyncio.run(self._send_message(
+            logger.error("Error checking free games: %s", e)
+            await send(
                 chat_id=chat_id,
                 text=f"❌ Error checking free games: {str(e)}"
-            ))
+            )
     
+    @_requires_auth(need_epic=True)
     async def _claim_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /claim command.
         
@@ -239,82 +538,142 @@ class TelegramBot:
             update: Telegram update object
             context: Callback context
         """
-        if not self._is_authorized(update):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-        
-        if not self.epic_client:
-            await update.message.reply_text("Epic Games client not connected to bot.")
-            return
-        
-        await update.message.reply_text("🎮 Claiming free games... This may take a moment.")
-        
-        # Run in a separate thread to avoid blocking
-        threading.Thread(target=self._claim_free_games_thread, args=(update.effective_chat.id,)).start()
-    
-    def _claim_free_games_thread(self, chat_id: int):
-        """Claim free games in a separate thread.
-        
+        await self._reply(update, "🎮 Claiming free games... This may take a moment.")
+
+        # The handler is registered with block=False, so awaiting here
+        # doesn't stall other updates; exceptions reach the error handler
+        # instead of dying in a detached task
+        await self._claim_free_games(update.effective_chat.id)
+
+    async def _claim_free_games(self, chat_id: int):
+        """Claim free games and report the results.
+
         Args:
             chat_id: Telegram chat ID to send results to
         """
+        # Bound once; each is dereferenced per game below
+        send = self._send_message
+        claim_game = self.epic_client.claim_game
         try:
+            loop = asyncio.get_running_loop()
+
             # Ensure authenticated
-            if not self.epic_client.ensure_authenticated():
-                asyncio.run(self._send_message(
+            if not await loop.run_in_executor(self._executor, self._ensure_authenticated_cached):
+                await send(
                     chat_id=chat_id,
                     text="❌ Not authenticated. Please log in first."
-                ))
+                )
                 return
-            
+
             # Get free games
-            free_games = self.epic_client.get_free_games()
-            
+            free_games = await loop.run_in_executor(self._executor, self._cached_free_games)
+
             if not free_games:
-                asyncio.run(self._send_message(
+                await send(
                     chat_id=chat_id,
                     text="✅ No new free games available to claim."
-                ))
+                )
                 return
-            
-            # Claim each free game
+
+            # Epic sometimes lists the same game under multiple offers;
+            # claiming a duplicate is a wasted round-trip
+            seen = set()
+            unique_games = [
+                game for game in free_games
+                if (key := game.get('id') or game.get('title')) not in seen
+                and not seen.add(key)
+            ]
+
+            # Per-game progress flows through a queue drained by its own
+            # task, so claim round-trips keep running while earlier
+            # progress messages wait in the send throttle
+            progress: asyncio.Queue = asyncio.Queue()
+
+            async def report_progress():
+                while True:
+                    item = await progress.get()
+                    if item is None:
+                        break
+                    title, ok = item
+                    await send(
+                        chat_id=chat_id,
+                        text=f"{'✅ Claimed' if ok else '❌ Failed'}: {title}"
+                    )
+
+            reporter = loop.create_task(report_progress())
+
+            # Claim games concurrently so N claims cost roughly one HTTP
+            # round-trip instead of N; cap in-flight requests to stay
+            # friendly to Epic's backend
+            semaphore = asyncio.Semaphore(5)
+
+            async def claim_one(game):
+                async with semaphore:
+                    ok = await loop.run_in_executor(
+                        self._executor, claim_game, game
+                    )
+                # Raw title here: progress messages go out as plain text,
+                # so Markdown escapes would show up as literal backslashes
+                title = game.get('title', _UNKNOWN)
+                progress.put_nowait((title, ok))
+                return title, ok
+
+            try:
+                # return_exceptions keeps one raising claim from cancelling
+                # the rest of the batch mid-flight
+                results = await asyncio.gather(
+                    *(claim_one(game) for game in unique_games),
+                    return_exceptions=True
+                )
+            finally:
+                progress.put_nowait(None)
+                await reporter
+
             claimed_games = []
             failed_games = []
-            
-            for game in free_games:
-                title = game.get('title', 'Unknown Game')
-                
-                if self.epic_client.claim_game(game):
-                    claimed_games.append(title)
-                else:
-                    failed_games.append(title)
-            
-            # Send results
-            message = "🎮 *Claim Results:*\n\n"
-            
+            for game, result in zip(unique_games, results):
+                if isinstance(result, BaseException):
+                    logger.error("Error claiming '%s': %s", game.get('title', _UNKNOWN), result)
+                    failed_games.append(_escape_md(game.get('title', _UNKNOWN)))
+                    continue
+                title, ok = result
+                (claimed_games if ok else failed_games).append(_escape_md(title))
+
             if claimed_games:
-                message += "✅ *Successfully claimed:*\n"
-                for i, title in enumerate(claimed_games, 1):
-                    message += f"{i}. {title}\n"
-                message += "\n"
-            
+                # The cached list no longer reflects the claimed set
+                self._free_games_cache = None
+            elif failed_games:
+                # Every claim failing usually means the session expired
+                # mid-run; don't trust the cached auth verdict next time
+                self._drop_auth_marker()
+
+            # Send results; build each section as a list and join once
+            parts = ["🎮 *Claim Results:*\n"]
+
+            if claimed_games:
+                parts.append("✅ *Successfully claimed:*")
+                parts.extend(f"{i}. {title}" for i, title in enumerate(claimed_games, 1))
+                parts.append("")
+
             if failed_games:
-                message += "❌ *Failed to claim:*\n"
-                for i, title in enumerate(failed_games, 1):
-                    message += f"{i}. {title}\n"
-            
-            asyncio.run(self._send_message(
+                parts.append("❌ *Failed to claim:*")
+                parts.extend(f"{i}. {title}" for i, title in enumerate(failed_games, 1))
+
+            message = "\n".join(parts)
+
+            await send(
                 chat_id=chat_id,
                 text=message,
                 parse_mode=ParseMode.MARKDOWN
-            ))
+            )
         except Exception as e:
-            logger.error(f"Error claiming free games: {e}")
-            asyncio.run(self._send_message(
+            logger.error("Error claiming free games: %s", e)
+            await send(
                 chat_id=chat_id,
                 text=f"❌ Error claiming free games: {str(e)}"
-            ))
+            )
     
+    @_requires_auth(need_epic=True, conversation=True)
     async def _tfa_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /tfa command.
         
@@ -325,28 +684,18 @@ class TelegramBot:
         Returns:
             int: Conversation state
         """
-        if not self._is_authorized(update):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return ConversationHandler.END
-        
-        if not self.epic_client:
-            await update.message.reply_text("Epic Games client not connected to bot.")
-            return ConversationHandler.END
-        
         if not self.tfa_callback:
-            await update.message.reply_text("No 2FA request pending.")
+            await self._reply(update, _NO_2FA_PENDING)
             return ConversationHandler.END
         
-        keyboard = [[InlineKeyboardButton("Cancel", callback_data="cancel_2fa")]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
         await update.message.reply_text(
             "Please enter your 2FA code from your authenticator app or email:",
-            reply_markup=reply_markup
+            reply_markup=self._CANCEL_2FA_MARKUP
         )
         
         return AWAITING_2FA
     
+    @_requires_auth(conversation=True)
     async def _process_2fa_code(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Process 2FA code input.
         
@@ -357,30 +706,36 @@ class TelegramBot:
         Returns:
             int: Conversation state
         """
-        if not self._is_authorized(update):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return ConversationHandler.END
-        
         code = update.message.text.strip()
         
-        await update.message.reply_text(f"Received 2FA code: {code}. Processing...")
+        await self._reply(update, f"Received 2FA code: {code}. Processing...")
         
-        # Call the 2FA callback if available
-        if self.tfa_callback:
-            success = self.tfa_callback(code)
-            
-            if success:
-                await update.message.reply_text("✅ 2FA authentication successful!")
-            else:
-                await update.message.reply_text("❌ 2FA authentication failed. Please try again.")
-            
-            # Reset callback
+        # Take the callback atomically so concurrent submissions can't
+        # both run it; the slow login round-trip happens outside the lock
+        async with self._tfa_lock:
+            callback = self.tfa_callback
             self.tfa_callback = None
+
+        if callback is None:
+            await self._reply(update, _NO_2FA_PENDING)
+            return ConversationHandler.END
+
+        # The callback does blocking HTTP against Epic; keep it off the
+        # event loop like the other Epic client calls
+        success = await asyncio.get_running_loop().run_in_executor(
+            self._executor, callback, code
+        )
+
+        if success:
+            await self._reply(update, "✅ 2FA authentication successful!")
         else:
-            await update.message.reply_text("No 2FA request pending.")
+            # Don't trust a cached verdict after a failed 2FA attempt
+            self._drop_auth_marker()
+            await self._reply(update, "❌ 2FA authentication failed. Please try again.")
         
         return ConversationHandler.END
     
+    @_requires_auth(conversation=True)
     async def _cancel_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /cancel command.
         
@@ -391,14 +746,11 @@ class TelegramBot:
         Returns:
             int: Conversation state
         """
-        if not self._is_authorized(update):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return ConversationHandler.END
-        
-        await update.message.reply_text("Operation cancelled.")
+        await self._reply(update, "Operation cancelled.")
         
         # Reset 2FA callback
-        self.tfa_callback = None
+        async with self._tfa_lock:
+            self.tfa_callback = None
         
         return ConversationHandler.END
     
@@ -409,91 +761,246 @@ class TelegramBot:
             update: Telegram update object
             context: Callback context
         """
-        logger.error(f"Update {update} caused error: {context.error}")
+        # Update.__repr__ walks the whole nested payload; only serialize it
+        # when debug logging will actually emit it
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Update %s caused error: %s", update, context.error)
+        else:
+            logger.error("Update caused error: %s", context.error)
         
-        if update and update.effective_message:
-            await update.effective_message.reply_text("An error occurred. Please try again later.")
+        # PTB passes whatever object triggered the error here; it isn't
+        # always an Update, so don't assume the attribute exists
+        message = getattr(update, "effective_message", None) if update else None
+        if message is None:
+            return
+
+        # At most one error reply per chat per 30s; a crash loop would
+        # otherwise turn into a flood of identical apologies
+        chat_id = message.chat_id
+        now = time.monotonic()
+        if now - self._last_error_reply.get(chat_id, 0.0) < 30:
+            return
+        self._last_error_reply[chat_id] = now
+
+        try:
+            await message.reply_text("An error occurred. Please try again later.")
+        except Exception:
+            # A failing reply must not re-enter the error handler
+            logger.exception("Failed to send error reply")
     
     def register_2fa_callback(self, callback: Callable[[str], bool]):
         """Register a callback for 2FA code processing.
         
+        Called from worker threads (the scheduler's claim cycle), so the
+        write is handed to the event loop instead of racing against the
+        handlers that read and clear the callback.
+
         Args:
             callback: Function to call with 2FA code
         """
-        self.tfa_callback = callback
+        if self._loop.is_running():
+            self._loop.call_soon_threadsafe(setattr, self, 'tfa_callback', callback)
+        else:
+            self.tfa_callback = callback
     
+    async def _throttle(self, chat_id: str):
+        """Wait until a send to the given chat fits the rate limits.
+
+        Args:
+            chat_id: Telegram chat ID the send is destined for
+        """
+        now = time.monotonic()
+
+        # Local alias: the deque is touched several times per send
+        times = self._global_send_times
+
+        # Drop timestamps that have left the one-second window
+        while times and now - times[0] > 1.0:
+            times.popleft()
+
+        delay = 0.0
+        if len(times) == times.maxlen:
+            delay = 1.0 - (now - times[0])
+
+        last = self._per_chat_last.get(chat_id, 0.0)
+        delay = max(delay, 1.0 - (now - last))
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
     async def _send_message(self, chat_id: str, text: str, parse_mode: str = None):
-        """Send a message to a specific chat.
-        
+        """Send a message to a specific chat, respecting Telegram rate limits.
+
         Args:
             chat_id: Telegram chat ID
             text: Message text
             parse_mode: Parse mode (None, ParseMode.MARKDOWN, or ParseMode.HTML)
         """
+        chat_key = str(chat_id)
+        send = self._bot.send_message
         try:
-            await self.application.bot.send_message(
-                chat_id=chat_id,
-                text=text,
-                parse_mode=parse_mode
-            )
+            await self._throttle(chat_key)
+            try:
+                await send(
+                    chat_id=chat_id,
+                    text=text,
+                    parse_mode=parse_mode
+                )
+            except RetryAfter as e:
+                # We still tripped the flood control; honour the server's
+                # backoff and retry once
+                logger.warning("Rate limited by Telegram, retrying in %ss", e.retry_after)
+                await asyncio.sleep(e.retry_after)
+                await send(
+                    chat_id=chat_id,
+                    text=text,
+                    parse_mode=parse_mode
+                )
+            now = time.monotonic()
+            self._per_chat_last[chat_key] = now
+            self._global_send_times.append(now)
             return True
         except Exception as e:
-            logger.error(f"Error sending message: {e}")
+            logger.error("Error sending message: %s", e)
             return False
     
+    def _run_coro(self, coro):
+        """Run a coroutine from synchronous code.
+
+        Uses the shared event loop when one is attached; otherwise falls
+        back to a throwaway loop.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            The coroutine's result
+        """
+        if not self._loop.is_running():
+            coro.close()
+            raise RuntimeError("Telegram bot event loop is not running; call start() first")
+        # Bounded wait so a stalled loop can't wedge the scheduler
+        # thread that called us
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout=60)
+
     def send_message(self, chat_id: str, message: str, parse_mode: str = None) -> bool:
         """Send a message to a specific chat (synchronous wrapper).
-        
+
         Args:
             chat_id: Telegram chat ID
             message: Message text
             parse_mode: Parse mode (None, 'Markdown', or 'HTML')
-            
+
         Returns:
             bool: True if message was sent successfully
         """
         try:
-            # Run the async function in a new event loop
-            return asyncio.run(self._send_message(
+            return self._run_coro(self._send_message(
                 chat_id=chat_id,
                 text=message,
                 parse_mode=parse_mode
             ))
         except Exception as e:
-            logger.error(f"Error sending message: {e}")
+            logger.error("Error sending message: %s", e)
             return False
     
+    async def _broadcast_async(self, message: str, parse_mode: str = None) -> bool:
+        """Send a message to all authorized chats concurrently.
+
+        Args:
+            message: Message text
+            parse_mode: Parse mode (None, 'Markdown', or 'HTML')
+
+        Returns:
+            bool: True if at least one message was sent successfully
+        """
+        results = await asyncio.gather(
+            *(self._send_message(chat_id=chat_id, text=message, parse_mode=parse_mode)
+              for chat_id in self.authorized_chat_ids),
+            return_exceptions=True
+        )
+        for chat_id, result in zip(self.authorized_chat_ids, results):
+            if isinstance(result, BaseException):
+                logger.error("Broadcast to chat %s failed: %s", chat_id, result)
+        return any(result is True for result in results)
+
     def broadcast_message(self, message: str, parse_mode: str = None) -> bool:
         """Send a message to all authorized chats.
-        
+
         Args:
             message: Message text
             parse_mode: Parse mode (None, 'Markdown', or 'HTML')
-            
+
         Returns:
             bool: True if at least one message was sent successfully
         """
-        success = False
-        
-        for chat_id in self.authorized_chat_ids:
-            result = self.send_message(chat_id, message, parse_mode)
-            success = success or result
-        
-        return success
-    
-    def _run_bot(self):
-        """Run the bot in a separate thread."""
-        asyncio.run(self.application.run_polling())
+        try:
+            return self._run_coro(self._broadcast_async(message, parse_mode))
+        except Exception as e:
+            logger.error("Error broadcasting message: %s", e)
+            return False
     
+    async def _start_receiving(self):
+        """Initialize the application and start receiving updates.
+
+        Uses webhook delivery when a public URL is configured; falls back
+        to long polling otherwise (e.g. local development).
+        """
+        await self.application.initialize()
+        await self.application.start()
+        if self.webhook_url:
+            # The token as URL path keeps the endpoint unguessable
+            await self.application.updater.start_webhook(
+                listen="0.0.0.0",
+                port=self.webhook_port,
+                url_path=self.token,
+                webhook_url=f"{self.webhook_url.rstrip('/')}/{self.token}"
+            )
+            logger.info("Telegram bot receiving updates via webhook")
+        else:
+            await self.application.updater.start_polling()
+
+    async def _stop_polling(self):
+        """Stop polling and shut the application down."""
+        if self.application.updater.running:
+            await self.application.updater.stop()
+        if self.application.running:
+            await self.application.stop()
+        await self.application.shutdown()
+
     def start(self):
-        """Start the bot."""
-        self.bot_thread = threading.Thread(target=self._run_bot)
-        self.bot_thread.daemon = True
-        self.bot_thread.start()
+        """Start the bot.
+
+        All bot coroutines — polling/webhook receipt and sends — run on
+        the one persistent loop; there is no per-bot polling thread with
+        its own asyncio.run anymore.
+        """
+        if self._owns_loop and not self._loop.is_running():
+            self._loop_thread.start()
+        future = asyncio.run_coroutine_threadsafe(self._start_receiving(), self._loop)
+        # The future is otherwise discarded; without this, a failed
+        # initialize()/start_polling()/start_webhook() dies silently
+        future.add_done_callback(self._log_startup_result)
         logger.info("Telegram bot started")
-    
+
+    @staticmethod
+    def _log_startup_result(future):
+        """Log the outcome of the startup coroutine."""
+        exc = future.exception()
+        if exc is not None:
+            logger.error("Telegram bot failed to start receiving updates: %s",
+                         exc, exc_info=exc)
+
     def stop(self):
         """Stop the bot."""
-        if self.application.running:
-            asyncio.run(self.application.stop())
+        try:
+            if self._loop.is_running():
+                asyncio.run_coroutine_threadsafe(self._stop_polling(), self._loop).result(timeout=10)
+        except Exception as e:
+            logger.error("Error stopping Telegram bot: %s", e)
+        if self._owns_loop and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            if self._loop_thread is not None:
+                self._loop_thread.join(timeout=5)
+        self._executor.shutdown(wait=False, cancel_futures=True)
         logger.info("Telegram bot stopped")